@@ -28,6 +28,17 @@ from sturdy.algo import naive_algorithm
 # import base miner class which takes care of most of the boilerplate
 from sturdy.base.miner import BaseMinerNeuron
 
+# name of bittensor's logging state when trace logging is enabled
+TRACE_STATE = "Trace"
+
+
+def trace_enabled() -> bool:
+    """
+    Whether bittensor logging is at the trace level, so that hot paths can skip formatting trace messages.
+    The state is read on every call, as the logging level is only configured once the neuron starts up.
+    """
+    return bt.logging.current_state_value == TRACE_STATE
+
 
 class Miner(BaseMinerNeuron):
     """
@@ -100,17 +111,17 @@ class Miner(BaseMinerNeuron):
 
         In practice it would be wise to blacklist requests from entities that are not validators, or do not have
         enough stake. This can be checked via metagraph.S and metagraph.validator_permit. You can always attain
-        the uid of the sender via a metagraph.hotkeys.index( synapse.dendrite.hotkey ) call.
+        the uid of the sender via a self.hotkey_to_uid[ synapse.dendrite.hotkey ] lookup.
 
         Otherwise, allow the request to be processed further.
         """
 
         bt.logging.info("Checking miner blacklist")
 
-        if synapse.dendrite.hotkey not in self.metagraph.hotkeys:  # type: ignore[]
+        requesting_uid = self.hotkey_to_uid.get(synapse.dendrite.hotkey)  # type: ignore[]
+        if requesting_uid is None:
             return True, "Hotkey is not registered"
 
-        requesting_uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)  # type: ignore[]
         stake = self.metagraph.S[requesting_uid].item()
 
         bt.logging.info(f"Requesting UID: {requesting_uid} | Stake at UID: {stake}")
@@ -125,7 +136,8 @@ class Miner(BaseMinerNeuron):
         if not validator_permit:
             return True, "Requesting UID has no validator permit"
 
-        bt.logging.trace(f"Allowing request from UID: {requesting_uid}")
+        if trace_enabled():
+            bt.logging.trace(f"Allowing request from UID: {requesting_uid}")
         return False, "Allowed"
 
     async def priority(self, synapse: sturdy.protocol.AllocateAssets) -> float:
@@ -148,9 +160,10 @@ class Miner(BaseMinerNeuron):
         Example priority logic:
         - A higher stake results in a higher priority value.
         """
-        caller_uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)  # Get the caller index. # type: ignore[]
+        caller_uid = self.hotkey_to_uid[synapse.dendrite.hotkey]  # Get the caller index. # type: ignore[]
         priority = float(self.metagraph.S[caller_uid])  # Return the stake as the priority.
-        bt.logging.trace(f"Prioritizing {synapse.dendrite.hotkey} with value: ", priority)  # type: ignore[]
+        if trace_enabled():
+            bt.logging.trace(f"Prioritizing {synapse.dendrite.hotkey} with value: {priority}")  # type: ignore[]
         return priority
 
 
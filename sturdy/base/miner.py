@@ -58,6 +58,9 @@ class BaseMinerNeuron(BaseNeuron):
 
         self.w3 = Web3(Web3.HTTPProvider(w3_provider_url))
 
+        # uid lookup for incoming requests - rebuilt whenever the metagraph is resynced
+        self.hotkey_to_uid = self._build_hotkey_to_uid()
+
         # Warn if allowing incoming requests from anyone.
         if not self.config.blacklist.force_validator_permit:
             bt.logging.warning("You are allowing non-validators to send requests to your miner. This is a security risk.")
@@ -206,3 +209,8 @@ class BaseMinerNeuron(BaseNeuron):
 
         # Sync the metagraph.
         self.metagraph.sync(subtensor=self.subtensor)
+        self.hotkey_to_uid = self._build_hotkey_to_uid()
+
+    def _build_hotkey_to_uid(self) -> dict[str, int]:
+        """Maps each hotkey in the metagraph to its uid."""
+        return {hotkey: uid for uid, hotkey in enumerate(self.metagraph.hotkeys)}
@@ -46,6 +46,9 @@ DB_DIR = "validator_database.db"  # default validator database dir
 
 # The following constants are for different pool models
 # Aave
+RAY = 10**27
+HALF_RAY = RAY // 2
+MAX_UINT256 = 2**256 - 1
 RESERVE_FACTOR_START_BIT_POSITION = 64
 RESERVE_FACTOR_MASK = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFF0000FFFFFFFFFFFFFFFF
 
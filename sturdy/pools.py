@@ -19,6 +19,7 @@ import json
 import math
 from decimal import Decimal
 from enum import IntEnum
+from functools import cache
 from pathlib import Path
 from typing import Any, ClassVar, Literal
 
@@ -52,6 +53,13 @@ class POOL_TYPES(IntEnum):
     AAVE_TARGET = 7
 
 
+@cache
+def load_abi(name: str) -> list:
+    """Loads the ABI of a contract from the abi directory - each file is only read and parsed once"""
+    with (Path(__file__).parent / "abi" / f"{name}.json").open() as abi_file:
+        return json.load(abi_file)
+
+
 def get_minimum_allocation(pool: "ChainBasedPoolModel") -> int:
     borrow_amount = 0
     our_supply = 0
@@ -62,12 +70,13 @@ def get_minimum_allocation(pool: "ChainBasedPoolModel") -> int:
             our_supply = pool._user_deposits
             assets_available = max(0, pool._total_supplied_assets - borrow_amount)
         case T if T in (POOL_TYPES.AAVE_DEFAULT, POOL_TYPES.AAVE_TARGET):
+            # amounts are scaled from the asset's decimals to 18 decimals
+            wad = 10**18
+            asset_unit = 10**pool._decimals
             # borrow amount for aave pools is total_stable_debt + total_variable_debt
-            borrow_amount = ((pool._nextTotalStableDebt * int(1e18)) // int(10**pool._decimals)) + (
-                (pool._totalVariableDebt * int(1e18)) // int(10**pool._decimals)
-            )
+            borrow_amount = (pool._nextTotalStableDebt * wad) // asset_unit + (pool._totalVariableDebt * wad) // asset_unit
             our_supply = pool._user_deposits
-            assets_available = max(0, ((pool._total_supplied_assets * int(1e18)) // int(10**pool._decimals)) - borrow_amount)
+            assets_available = max(0, (pool._total_supplied_assets * wad) // asset_unit - borrow_amount)
         case POOL_TYPES.COMPOUND_V3:
             borrow_amount = pool._total_borrow
             our_supply = pool._user_deposits
@@ -261,20 +270,14 @@ class AaveV3DefaultInterestRateV2Pool(ChainBasedPoolModel):
             bt.logging.error(err)  # type: ignore[]
 
         try:
-            atoken_abi_file_path = Path(__file__).parent / "abi/AToken.json"
-            atoken_abi_file = atoken_abi_file_path.open()
-            atoken_abi = json.load(atoken_abi_file)
-            atoken_abi_file.close()
+            atoken_abi = load_abi("AToken")
             atoken_contract = web3_provider.eth.contract(abi=atoken_abi, decode_tuples=True)
             self._atoken_contract = retry_with_backoff(
                 atoken_contract,
                 address=self.contract_address,
             )
 
-            pool_abi_file_path = Path(__file__).parent / "abi/Pool.json"
-            pool_abi_file = pool_abi_file_path.open()
-            pool_abi = json.load(pool_abi_file)
-            pool_abi_file.close()
+            pool_abi = load_abi("Pool")
 
             atoken_contract = self._atoken_contract
             pool_address = retry_with_backoff(atoken_contract.functions.POOL().call)
@@ -286,16 +289,14 @@ class AaveV3DefaultInterestRateV2Pool(ChainBasedPoolModel):
                 self._atoken_contract.functions.UNDERLYING_ASSET_ADDRESS().call,
             )
 
-            erc20_abi_file_path = Path(__file__).parent / "abi/IERC20.json"
-            erc20_abi_file = erc20_abi_file_path.open()
-            erc20_abi = json.load(erc20_abi_file)
-            erc20_abi_file.close()
+            erc20_abi = load_abi("IERC20")
 
             underlying_asset_contract = web3_provider.eth.contract(abi=erc20_abi, decode_tuples=True)
             self._underlying_asset_contract = retry_with_backoff(
                 underlying_asset_contract,
                 address=self._underlying_asset_address,
             )
+            self._decimals = retry_with_backoff(self._underlying_asset_contract.functions.decimals().call)
 
             self._total_supplied_assets = retry_with_backoff(self._atoken_contract.functions.totalSupply().call)
 
@@ -310,29 +311,12 @@ class AaveV3DefaultInterestRateV2Pool(ChainBasedPoolModel):
         if not self._initted:
             self.pool_init(web3_provider)
         try:
-            pool_abi_file_path = Path(__file__).parent / "abi/Pool.json"
-            pool_abi_file = pool_abi_file_path.open()
-            pool_abi = json.load(pool_abi_file)
-            pool_abi_file.close()
-
-            atoken_contract_onchain = self._atoken_contract
-            pool_address = retry_with_backoff(atoken_contract_onchain.functions.POOL().call)
-
-            pool_contract = web3_provider.eth.contract(abi=pool_abi, decode_tuples=True)
-            self._pool_contract = retry_with_backoff(pool_contract, address=pool_address)
-
-            self._underlying_asset_address = retry_with_backoff(
-                self._atoken_contract.functions.UNDERLYING_ASSET_ADDRESS().call,
-            )
-
+            # the pool and underlying asset of an atoken are immutable, so the contracts set up in pool_init are reused
             self._reserve_data = retry_with_backoff(
                 self._pool_contract.functions.getReserveData(self._underlying_asset_address).call,
             )
 
-            reserve_strat_abi_file_path = Path(__file__).parent / "abi/IReserveInterestRateStrategy.json"
-            reserve_strat_abi_file = reserve_strat_abi_file_path.open()
-            reserve_strat_abi = json.load(reserve_strat_abi_file)
-            reserve_strat_abi_file.close()
+            reserve_strat_abi = load_abi("IReserveInterestRateStrategy")
 
             strategy_contract = web3_provider.eth.contract(abi=reserve_strat_abi)
             self._strategy_contract = retry_with_backoff(
@@ -340,10 +324,7 @@ class AaveV3DefaultInterestRateV2Pool(ChainBasedPoolModel):
                 address=self._reserve_data.interestRateStrategyAddress,
             )
 
-            stable_debt_token_abi_file_path = Path(__file__).parent / "abi/IStableDebtToken.json"
-            stable_debt_token_abi_file = stable_debt_token_abi_file_path.open()
-            stable_debt_token_abi = json.load(stable_debt_token_abi_file)
-            stable_debt_token_abi_file.close()
+            stable_debt_token_abi = load_abi("IStableDebtToken")
 
             stable_debt_token_contract = web3_provider.eth.contract(abi=stable_debt_token_abi)
             stable_debt_token_contract = retry_with_backoff(
@@ -358,10 +339,7 @@ class AaveV3DefaultInterestRateV2Pool(ChainBasedPoolModel):
                 _,
             ) = retry_with_backoff(stable_debt_token_contract.functions.getSupplyData().call)
 
-            variable_debt_token_abi_file_path = Path(__file__).parent / "abi/IVariableDebtToken.json"
-            variable_debt_token_abi_file = variable_debt_token_abi_file_path.open()
-            variable_debt_token_abi = json.load(variable_debt_token_abi_file)
-            variable_debt_token_abi_file.close()
+            variable_debt_token_abi = load_abi("IVariableDebtToken")
 
             variable_debt_token_contract = web3_provider.eth.contract(abi=variable_debt_token_abi)
             self._variable_debt_token_contract = retry_with_backoff(
@@ -376,7 +354,6 @@ class AaveV3DefaultInterestRateV2Pool(ChainBasedPoolModel):
 
             reserveConfiguration = self._reserve_data.configuration
             self._reserveFactor = getReserveFactor(reserveConfiguration)
-            self._decimals = retry_with_backoff(self._underlying_asset_contract.functions.decimals().call)
             self._user_deposits = retry_with_backoff(
                 self._atoken_contract.functions.balanceOf(Web3.to_checksum_address(self.user_address)).call
             )
@@ -472,20 +449,14 @@ class AaveV3RateTargetBaseInterestRatePool(ChainBasedPoolModel):
             bt.logging.error(err)  # type: ignore[]
 
         try:
-            atoken_abi_file_path = Path(__file__).parent / "abi/AToken.json"
-            atoken_abi_file = atoken_abi_file_path.open()
-            atoken_abi = json.load(atoken_abi_file)
-            atoken_abi_file.close()
+            atoken_abi = load_abi("AToken")
             atoken_contract = web3_provider.eth.contract(abi=atoken_abi, decode_tuples=True)
             self._atoken_contract = retry_with_backoff(
                 atoken_contract,
                 address=self.contract_address,
             )
 
-            pool_abi_file_path = Path(__file__).parent / "abi/Pool.json"
-            pool_abi_file = pool_abi_file_path.open()
-            pool_abi = json.load(pool_abi_file)
-            pool_abi_file.close()
+            pool_abi = load_abi("Pool")
 
             atoken_contract = self._atoken_contract
             pool_address = retry_with_backoff(atoken_contract.functions.POOL().call)
@@ -497,16 +468,14 @@ class AaveV3RateTargetBaseInterestRatePool(ChainBasedPoolModel):
                 self._atoken_contract.functions.UNDERLYING_ASSET_ADDRESS().call,
             )
 
-            erc20_abi_file_path = Path(__file__).parent / "abi/IERC20.json"
-            erc20_abi_file = erc20_abi_file_path.open()
-            erc20_abi = json.load(erc20_abi_file)
-            erc20_abi_file.close()
+            erc20_abi = load_abi("IERC20")
 
             underlying_asset_contract = web3_provider.eth.contract(abi=erc20_abi, decode_tuples=True)
             self._underlying_asset_contract = retry_with_backoff(
                 underlying_asset_contract,
                 address=self._underlying_asset_address,
             )
+            self._decimals = retry_with_backoff(self._underlying_asset_contract.functions.decimals().call)
 
             self._total_supplied_assets = retry_with_backoff(self._atoken_contract.functions.totalSupply().call)
 
@@ -521,29 +490,12 @@ class AaveV3RateTargetBaseInterestRatePool(ChainBasedPoolModel):
         if not self._initted:
             self.pool_init(web3_provider)
         try:
-            pool_abi_file_path = Path(__file__).parent / "abi/Pool.json"
-            pool_abi_file = pool_abi_file_path.open()
-            pool_abi = json.load(pool_abi_file)
-            pool_abi_file.close()
-
-            atoken_contract_onchain = self._atoken_contract
-            pool_address = retry_with_backoff(atoken_contract_onchain.functions.POOL().call)
-
-            pool_contract = web3_provider.eth.contract(abi=pool_abi, decode_tuples=True)
-            self._pool_contract = retry_with_backoff(pool_contract, address=pool_address)
-
-            self._underlying_asset_address = retry_with_backoff(
-                self._atoken_contract.functions.UNDERLYING_ASSET_ADDRESS().call,
-            )
-
+            # the pool and underlying asset of an atoken are immutable, so the contracts set up in pool_init are reused
             self._reserve_data = retry_with_backoff(
                 self._pool_contract.functions.getReserveData(self._underlying_asset_address).call,
             )
 
-            reserve_strat_abi_file_path = Path(__file__).parent / "abi/RateTargetBaseInterestRateStrategy.json"
-            reserve_strat_abi_file = reserve_strat_abi_file_path.open()
-            reserve_strat_abi = json.load(reserve_strat_abi_file)
-            reserve_strat_abi_file.close()
+            reserve_strat_abi = load_abi("RateTargetBaseInterestRateStrategy")
 
             strategy_contract = web3_provider.eth.contract(abi=reserve_strat_abi)
             self._strategy_contract = retry_with_backoff(
@@ -551,10 +503,7 @@ class AaveV3RateTargetBaseInterestRatePool(ChainBasedPoolModel):
                 address=self._reserve_data.interestRateStrategyAddress,
             )
 
-            stable_debt_token_abi_file_path = Path(__file__).parent / "abi/IStableDebtToken.json"
-            stable_debt_token_abi_file = stable_debt_token_abi_file_path.open()
-            stable_debt_token_abi = json.load(stable_debt_token_abi_file)
-            stable_debt_token_abi_file.close()
+            stable_debt_token_abi = load_abi("IStableDebtToken")
 
             stable_debt_token_contract = web3_provider.eth.contract(abi=stable_debt_token_abi)
             stable_debt_token_contract = retry_with_backoff(
@@ -569,10 +518,7 @@ class AaveV3RateTargetBaseInterestRatePool(ChainBasedPoolModel):
                 _,
             ) = retry_with_backoff(stable_debt_token_contract.functions.getSupplyData().call)
 
-            variable_debt_token_abi_file_path = Path(__file__).parent / "abi/IVariableDebtToken.json"
-            variable_debt_token_abi_file = variable_debt_token_abi_file_path.open()
-            variable_debt_token_abi = json.load(variable_debt_token_abi_file)
-            variable_debt_token_abi_file.close()
+            variable_debt_token_abi = load_abi("IVariableDebtToken")
 
             variable_debt_token_contract = web3_provider.eth.contract(abi=variable_debt_token_abi)
             self._variable_debt_token_contract = retry_with_backoff(
@@ -587,7 +533,6 @@ class AaveV3RateTargetBaseInterestRatePool(ChainBasedPoolModel):
 
             reserveConfiguration = self._reserve_data.configuration
             self._reserveFactor = getReserveFactor(reserveConfiguration)
-            self._decimals = retry_with_backoff(self._underlying_asset_contract.functions.decimals().call)
             self._user_deposits = retry_with_backoff(
                 self._atoken_contract.functions.balanceOf(Web3.to_checksum_address(self.user_address)).call
             )
@@ -682,37 +627,25 @@ class VariableInterestSturdySiloStrategy(ChainBasedPoolModel):
             bt.logging.error(err)  # type: ignore[]
 
         try:
-            silo_strategy_abi_file_path = Path(__file__).parent / "abi/SturdySiloStrategy.json"
-            silo_strategy_abi_file = silo_strategy_abi_file_path.open()
-            silo_strategy_abi = json.load(silo_strategy_abi_file)
-            silo_strategy_abi_file.close()
+            silo_strategy_abi = load_abi("SturdySiloStrategy")
 
             silo_strategy_contract = web3_provider.eth.contract(abi=silo_strategy_abi, decode_tuples=True)
             self._silo_strategy_contract = retry_with_backoff(silo_strategy_contract, address=self.contract_address)
 
-            pair_abi_file_path = Path(__file__).parent / "abi/SturdyPair.json"
-            pair_abi_file = pair_abi_file_path.open()
-            pair_abi = json.load(pair_abi_file)
-            pair_abi_file.close()
+            pair_abi = load_abi("SturdyPair")
 
             pair_contract_address = retry_with_backoff(self._silo_strategy_contract.functions.pair().call)
             pair_contract = web3_provider.eth.contract(abi=pair_abi, decode_tuples=True)
             self._pair_contract = retry_with_backoff(pair_contract, address=pair_contract_address)
 
-            rate_model_abi_file_path = Path(__file__).parent / "abi/VariableInterestRate.json"
-            rate_model_abi_file = rate_model_abi_file_path.open()
-            rate_model_abi = json.load(rate_model_abi_file)
-            rate_model_abi_file.close()
+            rate_model_abi = load_abi("VariableInterestRate")
 
             rate_model_contract_address = retry_with_backoff(self._pair_contract.functions.rateContract().call)
             rate_model_contract = web3_provider.eth.contract(abi=rate_model_abi, decode_tuples=True)
             self._rate_model_contract = retry_with_backoff(rate_model_contract, address=rate_model_contract_address)
             self._decimals = retry_with_backoff(self._pair_contract.functions.decimals().call)
 
-            erc20_abi_file_path = Path(__file__).parent / "abi/IERC20.json"
-            erc20_abi_file = erc20_abi_file_path.open()
-            erc20_abi = json.load(erc20_abi_file)
-            erc20_abi_file.close()
+            erc20_abi = load_abi("IERC20")
 
             asset_address = retry_with_backoff(self._pair_contract.functions.asset().call)
             asset_contract = web3_provider.eth.contract(abi=erc20_abi, decode_tuples=True)
@@ -794,6 +727,7 @@ class CompoundV3Pool(ChainBasedPoolModel):
     _base_token_price: float = PrivateAttr()
     _reward_token_price: float = PrivateAttr()
     _base_decimals: int = PrivateAttr()
+    _reward_decimals: int = PrivateAttr()
     _total_borrow: int = PrivateAttr()
     _user_deposits: int = PrivateAttr()
     _total_supplied_assets: int = PrivateAttr()
@@ -803,24 +737,15 @@ class CompoundV3Pool(ChainBasedPoolModel):
     }
 
     def pool_init(self, web3_provider: Web3) -> None:
-        comet_abi_file_path = Path(__file__).parent / "abi/Comet.json"
-        comet_abi_file = comet_abi_file_path.open()
-        comet_abi = json.load(comet_abi_file)
-        comet_abi_file.close()
+        comet_abi = load_abi("Comet")
 
         # ctoken contract
         ctoken_contract = web3_provider.eth.contract(abi=comet_abi, decode_tuples=True)
         self._ctoken_contract = retry_with_backoff(ctoken_contract, address=self.contract_address)
 
-        oracle_abi_file_path = Path(__file__).parent / "abi/EACAggregatorProxy.json"
-        oracle_abi_file = oracle_abi_file_path.open()
-        oracle_abi = json.load(oracle_abi_file)
-        oracle_abi_file.close()
+        oracle_abi = load_abi("EACAggregatorProxy")
 
-        feed_registry_abi_file_path = Path(__file__).parent / "abi/FeedRegistry.json"
-        feed_registry_abi_file = feed_registry_abi_file_path.open()
-        feed_registry_abi = json.load(feed_registry_abi_file)
-        feed_registry_abi_file.close()
+        feed_registry_abi = load_abi("FeedRegistry")
 
         chainlink_registry_address = "0x47Fb2585D2C56Fe188D0E6ec628a38b74fCeeeDf"  # chainlink registry address on eth mainnet
         usd_address = "0x0000000000000000000000000000000000000348"  # follows: https://en.wikipedia.org/wiki/ISO_4217
@@ -841,6 +766,10 @@ class CompoundV3Pool(ChainBasedPoolModel):
         reward_oracle_contract = web3_provider.eth.contract(abi=oracle_abi, decode_tuples=True)
         self._reward_oracle_contract = retry_with_backoff(reward_oracle_contract, address=reward_oracle_address)
 
+        # price feed decimals don't change, so they are only fetched once
+        self._base_decimals = retry_with_backoff(self._base_oracle_contract.functions.decimals().call)
+        self._reward_decimals = retry_with_backoff(self._reward_oracle_contract.functions.decimals().call)
+
         self._initted = True
 
     def sync(self, web3_provider: Web3) -> None:
@@ -848,16 +777,13 @@ class CompoundV3Pool(ChainBasedPoolModel):
             self.pool_init(web3_provider)
 
         # get token prices - in wei
-        base_decimals = retry_with_backoff(self._base_oracle_contract.functions.decimals().call)
-        self._base_decimals = base_decimals
-        reward_decimals = retry_with_backoff(self._reward_oracle_contract.functions.decimals().call)
         self._total_borrow = retry_with_backoff(self._ctoken_contract.functions.totalBorrow().call)
 
         self._base_token_price = (
-            retry_with_backoff(self._base_oracle_contract.functions.latestAnswer().call) / 10**base_decimals
+            retry_with_backoff(self._base_oracle_contract.functions.latestAnswer().call) / 10**self._base_decimals
         )
         self._reward_token_price = (
-            retry_with_backoff(self._reward_oracle_contract.functions.latestAnswer().call) / 10**reward_decimals
+            retry_with_backoff(self._reward_oracle_contract.functions.latestAnswer().call) / 10**self._reward_decimals
         )
 
         self._user_deposits = retry_with_backoff(self._ctoken_contract.functions.balanceOf(self.user_address).call)
@@ -913,18 +839,12 @@ class DaiSavingsRate(ChainBasedPoolModel):
         return self._sdai_contract.address == other._sdai_contract.address  # type: ignore[]
 
     def pool_init(self, web3_provider: Web3) -> None:
-        sdai_abi_file_path = Path(__file__).parent / "abi/SavingsDai.json"
-        sdai_abi_file = sdai_abi_file_path.open()
-        sdai_abi = json.load(sdai_abi_file)
-        sdai_abi_file.close()
+        sdai_abi = load_abi("SavingsDai")
 
         sdai_contract = web3_provider.eth.contract(abi=sdai_abi, decode_tuples=True)
         self._sdai_contract = retry_with_backoff(sdai_contract, address=self.contract_address)
 
-        pot_abi_file_path = Path(__file__).parent / "abi/Pot.json"
-        pot_abi_file = pot_abi_file_path.open()
-        pot_abi = json.load(pot_abi_file)
-        pot_abi_file.close()
+        pot_abi = load_abi("Pot")
 
         pot_address = retry_with_backoff(self._sdai_contract.functions.pot().call)
 
@@ -980,18 +900,12 @@ class MorphoVault(ChainBasedPoolModel):
         return self._vault_contract.address == other._vault_contract.address  # type: ignore[]
 
     def pool_init(self, web3_provider: Web3) -> None:
-        vault_abi_file_path = Path(__file__).parent / "abi/MetaMorpho.json"
-        vault_abi_file = vault_abi_file_path.open()
-        vault_abi = json.load(vault_abi_file)
-        vault_abi_file.close()
+        vault_abi = load_abi("MetaMorpho")
 
         vault_contract = web3_provider.eth.contract(abi=vault_abi, decode_tuples=True)
         self._vault_contract = retry_with_backoff(vault_contract, address=self.contract_address)
 
-        morpho_abi_file_path = Path(__file__).parent / "abi/Morpho.json"
-        morpho_abi_file = morpho_abi_file_path.open()
-        morpho_abi = json.load(morpho_abi_file)
-        morpho_abi_file.close()
+        morpho_abi = load_abi("Morpho")
 
         morpho_address = retry_with_backoff(self._vault_contract.functions.MORPHO().call)
 
@@ -1002,17 +916,11 @@ class MorphoVault(ChainBasedPoolModel):
         self._DECIMALS_OFFSET = retry_with_backoff(self._vault_contract.functions.DECIMALS_OFFSET().call)
         self._asset_decimals = self._decimals - self._DECIMALS_OFFSET
 
-        irm_abi_file_path = Path(__file__).parent / "abi/AdaptiveCurveIrm.json"
-        irm_abi_file = irm_abi_file_path.open()
-        self._irm_abi = json.load(irm_abi_file)
-        irm_abi_file.close()
+        self._irm_abi = load_abi("AdaptiveCurveIrm")
 
         underlying_asset_address = retry_with_backoff(self._vault_contract.functions.asset().call)
 
-        erc20_abi_file_path = Path(__file__).parent / "abi/IERC20.json"
-        erc20_abi_file = erc20_abi_file_path.open()
-        erc20_abi = json.load(erc20_abi_file)
-        erc20_abi_file.close()
+        erc20_abi = load_abi("IERC20")
 
         underlying_asset_contract = web3_provider.eth.contract(abi=erc20_abi, decode_tuples=True)
         self._underlying_asset_contract = retry_with_backoff(
@@ -1128,26 +1036,17 @@ class YearnV3Vault(ChainBasedPoolModel):
     _yield_index: int = PrivateAttr()
 
     def pool_init(self, web3_provider: Web3) -> None:
-        vault_abi_file_path = Path(__file__).parent / "abi/Yearn_V3_Vault.json"
-        vault_abi_file = vault_abi_file_path.open()
-        vault_abi = json.load(vault_abi_file)
-        vault_abi_file.close()
+        vault_abi = load_abi("Yearn_V3_Vault")
 
         vault_contract = web3_provider.eth.contract(abi=vault_abi, decode_tuples=True)
         self._vault_contract = retry_with_backoff(vault_contract, address=self.contract_address)
 
-        apr_oracle_abi_file_path = Path(__file__).parent / "abi/AprOracle.json"
-        apr_oracle_abi_file = apr_oracle_abi_file_path.open()
-        apr_oracle_abi = json.load(apr_oracle_abi_file)
-        apr_oracle_abi_file.close()
+        apr_oracle_abi = load_abi("AprOracle")
 
         apr_oracle = web3_provider.eth.contract(abi=apr_oracle_abi, decode_tuples=True)
         self._apr_oracle = retry_with_backoff(apr_oracle, address=APR_ORACLE)
 
-        erc20_abi_file_path = Path(__file__).parent / "abi/IERC20.json"
-        erc20_abi_file = erc20_abi_file_path.open()
-        erc20_abi = json.load(erc20_abi_file)
-        erc20_abi_file.close()
+        erc20_abi = load_abi("IERC20")
 
         asset_address = retry_with_backoff(self._vault_contract.functions.asset().call)
         asset_contract = web3_provider.eth.contract(abi=erc20_abi, decode_tuples=True)
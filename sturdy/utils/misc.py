@@ -16,12 +16,12 @@
 # OF CONTRACT, TORT OR OTHERWISE, ARISING FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 # DEALINGS IN THE SOFTWARE.
 
+import random
 import time
 from collections.abc import Callable
 from datetime import datetime, timezone
 from functools import lru_cache, update_wrapper
-from math import floor
-from typing import Any
+from typing import Any, NamedTuple
 
 import bittensor as bt
 import numpy as np
@@ -29,14 +29,37 @@ import numpy.typing as npt
 from pydantic import BaseModel
 
 from sturdy.constants import (
+    HALF_RAY,
+    MAX_UINT256,
+    RAY,
     RESERVE_FACTOR_MASK,
     RESERVE_FACTOR_START_BIT_POSITION,
     SIG_FIGS,
 )
-from sturdy.utils.ethmath import wei_div, wei_mul
 
 # TODO: cleanup functions - lay them out better across files?
 
+# substrings of exception messages which indicate that we are being rate limited
+RATE_LIMIT_ERRORS = ("Rate limited", "Too Many Requests")
+
+# shared generator for scalar draws - the stdlib generator has much less per-call overhead than numpy's
+_rng = random.Random()  # noqa: S311
+
+# separates positional from keyword arguments in the keys of the single-entry ttl cache
+_KWD_MARK = object()
+
+# the reserve factor field of an aave reserve configuration, shifted down to bit 0 (i.e. 0xFFFF)
+_RESERVE_FACTOR_FIELD = (~RESERVE_FACTOR_MASK & MAX_UINT256) >> RESERVE_FACTOR_START_BIT_POSITION
+
+
+class _CacheInfo(NamedTuple):
+    """Mirrors the named tuple returned by the cache_info() of functools.lru_cache"""
+
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
 
 def normalize_numpy(arr, p=1, axis=0, epsilon=1e-12) -> npt.NDArray:
     """
@@ -78,30 +101,59 @@ def randrange_float(
     step,
     sig: int = SIG_FIGS,
     max_prec: int = SIG_FIGS,
-    rng_gen: Any = np.random.RandomState,
+    rng_gen: random.Random = _rng,
 ) -> float:
-    num_steps = int((stop - start) / step)
-    random_step = rng_gen.randint(0, num_steps + 1)
-    return format_num_prec(start + random_step * step, sig=sig, max_prec=max_prec)
-
-
-def retry_with_backoff(func, *args: Any, **kwargs: Any) -> Any:
+    # work on integers scaled to the output precision, so that neither the step count nor the result pick up
+    # float rounding error, and convert back to a float only once at the end
+    scale = 10 ** min(sig, max_prec)
+
+    def to_scaled(x) -> int:
+        # integral values (e.g. wei amounts) are scaled exactly, as multiplying huge floats loses precision
+        return int(x) * scale if float(x).is_integer() else round(x * scale)
+
+    start_scaled = to_scaled(start)
+    stop_scaled = to_scaled(stop)
+    step_scaled = to_scaled(step)
+    if step_scaled <= 0:
+        raise ValueError(f"step must be a positive multiple of {1 / scale}")
+
+    num_steps = (stop_scaled - start_scaled) // step_scaled
+    # random.Random.randint includes the upper bound
+    random_step = rng_gen.randint(0, num_steps)
+    return (start_scaled + random_step * step_scaled) / scale
+
+
+def retry_with_backoff(
+    func,
+    *args: Any,
+    max_retries: int = 5,
+    base_delay: float = 0.1,
+    max_delay: float = 60,
+    **kwargs: Any,
+) -> Any:
     """
-    Retry a function with exponential backoff and jitter when rate limited.
-    """
-    max_retries = 5  # Maximum number of retries
-    base_delay = 0.1  # Initial delay in seconds
-    max_delay = 60  # Maximum delay in seconds
+    Retry a function with exponential backoff and decorrelated jitter when rate limited.
 
+    Args:
+        func: The function to call.
+        max_retries (int): Maximum number of retries. Defaults to 5.
+        base_delay (float): Initial (and minimum) delay in seconds. Defaults to 0.1.
+        max_delay (float): Maximum delay in seconds. Defaults to 60.
+        *args, **kwargs: Passed through to `func`.
+    """
+    delay = base_delay
     retries = 0
     while retries < max_retries:
         try:
             return func(*args, **kwargs)
         except Exception as e:
-            if "Rate limited" in str(e):
-                delay = min(base_delay * 2**retries, max_delay)
-                jitter = np.random.uniform(delay / 2, delay * 1.5)
-                time.sleep(jitter)
+            # http errors are checked by status code - matching "429" in the message would also catch addresses,
+            # amounts or block numbers which happen to contain those digits
+            status_code = getattr(getattr(e, "response", None), "status_code", None)
+            if status_code == 429 or any(msg in str(e) for msg in RATE_LIMIT_ERRORS):
+                # decorrelated jitter: each delay is drawn relative to the previous one
+                delay = min(max_delay, random.uniform(base_delay, delay * 3))  # noqa: S311
+                time.sleep(delay)
                 retries += 1
             else:
                 raise
@@ -113,46 +165,23 @@ def rayMul(a: int, b: int) -> int:  # noqa: N802
     See:
     https://github.com/aave/aave-v3-core/blob/724a9ef43adf139437ba87dcbab63462394d4601/contracts/protocol/libraries/math/WadRayMath.sol#L65
     """
-    HALF_RAY = 10**27 // 2
-    RAY = 10**27
-
     # Check for overflow
-    if b == 0 or a <= (2**256 - 1 - HALF_RAY) // b:
+    if b == 0 or a <= (MAX_UINT256 - HALF_RAY) // b:
         return (a * b + HALF_RAY) // RAY
     raise ValueError("Multiplication overflow")
 
 
 def getReserveFactor(reserve_configuration) -> int:  # noqa: N802
-    return (reserve_configuration.data & ~RESERVE_FACTOR_MASK) >> RESERVE_FACTOR_START_BIT_POSITION
+    return (reserve_configuration.data >> RESERVE_FACTOR_START_BIT_POSITION) & _RESERVE_FACTOR_FIELD
 
 
 def get_synapse_from_body(
     body: BaseModel,
     synapse_model: type[bt.Synapse],
 ) -> bt.Synapse:
-    body_dict = body.dict()
-    return synapse_model(**body_dict)
-
-
-def format_num_prec(num: float, sig: int = SIG_FIGS, max_prec: int = SIG_FIGS) -> float:
-    return float(f"{{0:.{max_prec}f}}".format(float(format(num, f".{sig}f"))))
-
-
-def borrow_rate(util_rate, pool) -> int:
-    return (
-        pool.base_rate + wei_mul(wei_div(util_rate, pool.optimal_util_rate), pool.base_slope)
-        if util_rate < pool.optimal_util_rate
-        else pool.base_rate
-        + pool.base_slope
-        + wei_mul(
-            wei_div((util_rate - pool.optimal_util_rate), (1e18 - pool.optimal_util_rate)),
-            pool.kink_slope,
-        )
-    )
-
-
-def supply_rate(util_rate, pool) -> int:
-    return wei_mul(util_rate, pool.borrow_rate)
+    # pass the validated field values through as-is - dumping the body first would serialize the nested
+    # pool models only for the synapse to validate them back into the very same models
+    return synapse_model(**dict(body))
 
 
 # LRU Cache with TTL
@@ -185,39 +214,77 @@ def ttl_cache(maxsize: int = 128, typed: bool = False, ttl: int = -1) -> Any:
     """
     if ttl <= 0:
         ttl = 65536
-    hash_gen = _ttl_hash_gen(ttl)
+    ttl_ns = ttl * 1_000_000_000
 
     def wrapper(func: Callable) -> Callable:
+        if maxsize == 1:
+            return update_wrapper(_single_entry_ttl_cache(func, ttl_ns, typed), func)
+
         @lru_cache(maxsize, typed)
         def ttl_func(ttl_hash, *args, **kwargs) -> Any:  # noqa: ANN002, ANN003, ARG001
             return func(*args, **kwargs)
 
         def wrapped(*args, **kwargs) -> Any:  # noqa: ANN002, ANN003
-            th = next(hash_gen)
-            return ttl_func(th, *args, **kwargs)
+            # the ttl hash is the index of the current `ttl` second interval on the monotonic clock,
+            # so cached entries are invalidated once that interval has passed. the clock is looked up on every
+            # call rather than bound once, so that it can still be patched (e.g. by freezegun) after decoration
+            return ttl_func(time.monotonic_ns() // ttl_ns, *args, **kwargs)
 
+        wrapped.cache_info = ttl_func.cache_info  # type: ignore[attr-defined]
+        wrapped.cache_clear = ttl_func.cache_clear  # type: ignore[attr-defined]
         return update_wrapper(wrapped, func)
 
     return wrapper
 
 
-def _ttl_hash_gen(seconds: int):  # noqa: ANN202
+def _single_entry_ttl_cache(func: Callable, ttl_ns: int, typed: bool) -> Callable:
     """
-    Internal generator function used by the `ttl_cache` decorator to generate a new hash value at regular
-    time intervals specified by `seconds`.
+    Internal helper used by the `ttl_cache` decorator when `maxsize` is 1. Only the most recent call is kept,
+    so the dict lookups and linked-list bookkeeping of `functools.lru_cache` can be skipped entirely.
 
     Args:
-        seconds (int): The number of seconds after which a new hash value will be generated.
+        func (Callable): The function to cache.
+        ttl_ns (int): The time-to-live of the cached entry, in nanoseconds.
+        typed (bool): If set to True, arguments of different types will be cached separately.
 
-    Yields:
-        int: A hash value that represents the current time interval.
-
-    This generator is used to create time-based hash values that enable the `ttl_cache` to determine
-    whether cached entries are still valid or if they have expired and should be recalculated.
+    Returns:
+        Callable: The wrapped function.
     """
-    start_time = time.time()
-    while True:
-        yield floor((time.time() - start_time) / seconds)
+    # (ttl hash, key, result) of the last call - replaced as a whole so that readers never see a partial update
+    last_call = [None]
+    # [hits, misses], reported through cache_info() like lru_cache does
+    stats = [0, 0]
+
+    def wrapped(*args, **kwargs) -> Any:  # noqa: ANN002, ANN003
+        th = time.monotonic_ns() // ttl_ns
+        # keyword arguments are flattened in after a sentinel (like lru_cache does), so that
+        # e.g. f(1, k=3) and f((1,), (("k", 3),)) get distinct keys
+        key = args
+        if kwargs:
+            key += (_KWD_MARK, *kwargs.items())
+        if typed:
+            key += tuple(type(v) for v in args) + tuple(type(v) for v in kwargs.values())
+
+        entry = last_call[0]
+        if entry is not None and entry[0] == th and entry[1] == key:
+            stats[0] += 1
+            return entry[2]
+
+        stats[1] += 1
+        result = func(*args, **kwargs)
+        last_call[0] = (th, key, result)
+        return result
+
+    def cache_info() -> _CacheInfo:
+        return _CacheInfo(stats[0], stats[1], 1, 0 if last_call[0] is None else 1)
+
+    def cache_clear() -> None:
+        last_call[0] = None
+        stats[0] = stats[1] = 0
+
+    wrapped.cache_info = cache_info  # type: ignore[attr-defined]
+    wrapped.cache_clear = cache_clear  # type: ignore[attr-defined]
+    return wrapped
 
 
 # 12 seconds updating block.
@@ -187,11 +187,13 @@ async def query_and_score_miners(
     bt.logging.debug(f"Active allocs: {active_alloc_rows}")
 
     uids_to_delete = []
+    # active allocations usually share pools - only sync each of them once while scoring them
+    synced_pools = {}
     for active_alloc in active_alloc_rows:
         request_uid = active_alloc["request_uid"]
         uids_to_delete.append(request_uid)
         # calculate rewards for previous active allocations
-        miner_uids, rewards = get_rewards(self, active_alloc)
+        miner_uids, rewards = get_rewards(self, active_alloc, synced_pools)
         bt.logging.debug(f"miner rewards: {rewards}")
         bt.logging.debug(f"sim penalities: {self.similarity_penalties}")
 
@@ -219,7 +221,7 @@ async def query_and_score_miners(
         assets_and_pools=assets_and_pools,
     )
 
-    sorted_indices = [idx for idx, val in sorted(enumerate(self.scores), key=lambda k: k[1], reverse=True)]
+    sorted_indices = sorted(range(len(self.scores)), key=self.scores.__getitem__, reverse=True)
 
     sorted_allocs = {}
     rank = 1
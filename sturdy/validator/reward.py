@@ -20,7 +20,6 @@ import json
 from typing import Any, cast
 
 import bittensor as bt
-import gmpy2
 import numpy as np
 import numpy.typing as npt
 
@@ -70,25 +69,23 @@ def format_allocations(
     # TODO: better way to do this?
     if allocations is None:
         allocations = {}
-    allocs = allocations.copy()
     pools: Any = assets_and_pools["pools"]
 
-    # pad the allocations
-    for contract_addr in pools:
-        if contract_addr not in allocs:
-            allocs[contract_addr] = 0
-
-    # sort the allocations by contract address
-    return {contract_addr: allocs[contract_addr] for contract_addr in sorted(allocs.keys())}
+    # pad the allocations with the pools which weren't allocated to, and sort them by contract address
+    return {contract_addr: allocations.get(contract_addr, 0) for contract_addr in sorted(allocations.keys() | pools)}
 
 
 def normalize_exp(apys_and_allocations: AllocationsDict, epsilon: float = 1e-8) -> npt.NDArray:
-    raw_apys = {uid: apys_and_allocations[uid]["apy"] for uid in apys_and_allocations}
+    num_miners = len(apys_and_allocations)
 
-    if len(raw_apys) <= 1:
-        return np.zeros(len(raw_apys))
+    if num_miners <= 1:
+        return np.zeros(num_miners)
 
-    apys = np.array(list(raw_apys.values()), dtype=np.float32)
+    apys = np.fromiter(
+        (info["apy"] for info in apys_and_allocations.values()),
+        dtype=np.float32,
+        count=num_miners,
+    )
     normed = (apys - apys.min()) / (apys.max() - apys.min() + epsilon)
 
     return np.pow(normed, 8)
@@ -120,27 +117,27 @@ def calculate_penalties(
 
 
 def calculate_rewards_with_adjusted_penalties(miners, rewards_apy, penalties) -> npt.NDArray:
-    rewards = np.zeros(len(miners))
     max_penalty = max(penalties.values())
     if max_penalty == 0:
         return rewards_apy
 
-    for idx, miner_id in enumerate(miners):
-        # Calculate penalty adjustment
-        penalty_factor = (max_penalty - penalties[miner_id]) / max_penalty
-
-        # Calculate the final reward
-        reward = rewards_apy[idx] * penalty_factor
-        rewards[idx] = reward
+    # scale each miner's reward down by its penalty relative to the largest penalty, for all miners at once
+    miner_penalties = np.fromiter((penalties[miner_id] for miner_id in miners), dtype=np.float64, count=len(miners))
+    penalty_factors = (max_penalty - miner_penalties) / max_penalty
 
-    return rewards
+    return np.asarray(rewards_apy, dtype=np.float64) * penalty_factors
 
 
 def get_distance(alloc_a: npt.NDArray, alloc_b: npt.NDArray, total_assets: int) -> float:
     try:
-        diff = alloc_a - alloc_b
-        norm = gmpy2.sqrt(sum(x**2 for x in diff))
-        return norm / gmpy2.sqrt(2 * total_assets**2)
+        # normalize by the total assets before squaring, so that the float64 math can't overflow for large wei amounts
+        scale = float(total_assets)
+        diff = (np.asarray(alloc_a, dtype=np.float64) - np.asarray(alloc_b, dtype=np.float64)) / (scale or 1.0)
+        distance = float(np.sqrt(np.dot(diff, diff) / 2))
+        if scale == 0:
+            # the norm divided by no assets at all - nan for identical allocations, inf otherwise
+            return float("nan") if distance == 0 else float("inf")
+        return distance  # noqa: TRY300
     except Exception as e:
         bt.logging.error("Could not obtain distance - default to 69.0")
         bt.logging.error(e)
@@ -177,22 +174,40 @@ def get_allocation_similarity_matrix(
 
     similarity_matrix = {}
     total_assets = cast(int, assets_and_pools["total_assets"])
-    for miner_a, info_a in apys_and_allocations.items():
-        _alloc_a = cast(AllocationsDict, info_a["allocations"])
-        alloc_a = np.array(
-            [gmpy2.mpz(x) for x in list(format_allocations(_alloc_a, assets_and_pools).values())],
-        )
+    # build each miner's allocation vector once, rather than once per pair of miners - None if they didn't allocate
+    alloc_vectors = {
+        miner: np.fromiter(format_allocations(allocs, assets_and_pools).values(), dtype=np.float64)
+        if (allocs := cast(AllocationsDict, info["allocations"])) is not None
+        else None
+        for miner, info in apys_and_allocations.items()
+    }
+    miners_with_allocs = {miner: idx for idx, miner in enumerate(m for m, v in alloc_vectors.items() if v is not None)}
+
+    distances = None
+    if miners_with_allocs and len({alloc_vectors[miner].shape for miner in miners_with_allocs}) == 1:
+        # compute the distances between all pairs of miners at once. the differences are broadcast rather than
+        # expanded into ||a||^2 + ||b||^2 - 2ab, as that cancels catastrophically for (near) identical allocations
+        alloc_matrix = np.stack([alloc_vectors[miner] for miner in miners_with_allocs])
+        scale = float(total_assets)
+        diffs = (alloc_matrix[:, None, :] - alloc_matrix[None, :, :]) / (scale or 1.0)
+        distances = np.sqrt(np.einsum("ijk,ijk->ij", diffs, diffs) / 2)
+        if scale == 0:
+            # same as get_distance - nan for identical allocations, inf otherwise
+            distances = np.where(distances == 0, np.nan, np.inf)
+
+    for miner_a, alloc_a in alloc_vectors.items():
         similarity_matrix[miner_a] = {}
-        for miner_b, info_b in apys_and_allocations.items():
+        for miner_b, alloc_b in alloc_vectors.items():
             if miner_a != miner_b:
-                _alloc_b = cast(AllocationsDict, info_b["allocations"])
-                if _alloc_a is None or _alloc_b is None:
+                if alloc_a is None or alloc_b is None:
                     similarity_matrix[miner_a][miner_b] = float("inf")
-                    continue
-                alloc_b = np.array(
-                    [gmpy2.mpz(x) for x in list(format_allocations(_alloc_b, assets_and_pools).values())],
-                )
-                similarity_matrix[miner_a][miner_b] = get_distance(alloc_a, alloc_b, total_assets)
+                elif distances is not None:
+                    similarity_matrix[miner_a][miner_b] = float(
+                        distances[miners_with_allocs[miner_a], miners_with_allocs[miner_b]]
+                    )
+                else:
+                    # allocation vectors of different lengths can't be stacked - compare them pair by pair
+                    similarity_matrix[miner_a][miner_b] = get_distance(alloc_a, alloc_b, total_assets)
 
     return similarity_matrix
 
@@ -226,13 +241,15 @@ def get_apy_similarity_matrix(
 
     for miner_a, info_a in apys_and_allocations.items():
         apy_a = cast(int, info_a["apy"])
-        apy_a = np.array([gmpy2.mpz(apy_a)], dtype=object)
         similarity_matrix[miner_a] = {}
         for miner_b, info_b in apys_and_allocations.items():
             if miner_a != miner_b:
                 apy_b = cast(int, info_b["apy"])
-                apy_b = np.array([gmpy2.mpz(apy_b)], dtype=object)
-                similarity_matrix[miner_a][miner_b] = get_distance(apy_a, apy_b, max(apy_a, apy_b)[0])  # Max scaling
+                similarity_matrix[miner_a][miner_b] = get_distance(
+                    np.array([apy_a], dtype=np.float64),
+                    np.array([apy_b], dtype=np.float64),
+                    max(apy_a, apy_b),  # Max scaling
+                )
 
     return similarity_matrix
 
@@ -431,7 +448,19 @@ def filter_allocations(
     return axon_times, curr_filtered_allocs
 
 
-def get_rewards(self, active_allocation) -> tuple[list, dict]:
+def get_rewards(self, active_allocation, synced_pools: dict | None = None) -> tuple[list, dict]:
+    """
+    Scores the miner allocations of an active allocation request.
+
+    Args:
+    - active_allocation: The active allocation to score.
+    - synced_pools (dict | None): Optional cache of pools which have already been synced in the current scoring pass,
+        keyed by pool type, contract address and user address. Pools found in here are reused rather than being
+        created and synced again, and newly synced pools are added to it.
+
+    Returns:
+    - tuple[list, dict]: The uids of the scored miners, and their rewards.
+    """
     # a dictionary, miner uids -> apy and allocations
     apys_and_allocations = {}
     miner_uids = []
@@ -464,15 +493,21 @@ def get_rewards(self, active_allocation) -> tuple[list, dict]:
     pools = assets_and_pools["pools"]
     new_pools = {}
     for uid, pool in pools.items():
-        new_pool = PoolFactory.create_pool(
-            pool_type=pool["pool_type"],
-            web3_provider=self.w3,  # type: ignore[]
-            user_address=(pool["user_address"]),  # TODO: is there a cleaner way to do this?
-            contract_address=pool["contract_address"],
-        )
-
-        # sync pool
-        new_pool.sync(self.w3)
+        pool_key = (pool["pool_type"], pool["contract_address"], pool["user_address"])
+        new_pool = synced_pools.get(pool_key) if synced_pools is not None else None
+        if new_pool is None:
+            new_pool = PoolFactory.create_pool(
+                pool_type=pool["pool_type"],
+                web3_provider=self.w3,  # type: ignore[]
+                user_address=(pool["user_address"]),  # TODO: is there a cleaner way to do this?
+                contract_address=pool["contract_address"],
+            )
+
+            # sync pool
+            new_pool.sync(self.w3)
+            if synced_pools is not None:
+                synced_pools[pool_key] = new_pool
+
         new_pools[uid] = new_pool
 
     assets_and_pools["pools"] = new_pools
@@ -98,8 +98,8 @@ def delete_api_key(conn: sqlite3.Connection, api_key: str) -> None:
 
 def update_requests_and_credits(conn: sqlite3.Connection, api_key_info: dict, cost: float) -> None:
     conn.execute(
-        f"UPDATE api_keys SET {BALANCE} = {BALANCE} - {cost} WHERE {KEY} = ?",
-        (api_key_info[KEY],),
+        f"UPDATE api_keys SET {BALANCE} = {BALANCE} - ? WHERE {KEY} = ?",
+        (cost, api_key_info[KEY]),
     )
 
 
@@ -117,17 +117,17 @@ def log_request(conn: sqlite3.Connection, api_key_info: dict, path: str, cost: f
 def rate_limit_exceeded(conn: sqlite3.Connection, api_key_info: dict) -> bool:
     one_minute_ago = datetime.now() - timedelta(minutes=1)  # noqa: DTZ005
 
-    # Prepare a SQL statement
+    # Prepare a SQL statement - only the number of recent requests is needed, so let sqlite count them
     query = f"""
-        SELECT *
+        SELECT COUNT(*)
         FROM logs
         WHERE {KEY} = ? AND {CREATED_AT} >= ?
     """
 
     cur = conn.execute(query, (api_key_info[KEY], one_minute_ago.strftime("%Y-%m-%d %H:%M:%S")))
-    recent_logs = cur.fetchall()
+    num_recent_logs = cur.fetchone()[0]
 
-    return len(recent_logs) >= api_key_info[RATE_LIMIT_PER_MINUTE]
+    return num_recent_logs >= api_key_info[RATE_LIMIT_PER_MINUTE]
 
 
 def to_json_string(input_data) -> str:
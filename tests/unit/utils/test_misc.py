@@ -0,0 +1,207 @@
+import random
+import unittest
+from types import SimpleNamespace
+from typing import Any
+from unittest import mock
+
+import pytest
+
+from sturdy.utils.misc import randrange_float, retry_with_backoff, ttl_cache
+
+SECOND_NS = 1_000_000_000
+
+
+class HTTPStatusError(Exception):
+    def __init__(self, status_code: int) -> None:
+        super().__init__(f"{status_code} error")
+        self.response = SimpleNamespace(status_code=status_code)
+
+
+class FlakyCall:
+    """Raises the given exception for the first `failures` calls, then returns "ok" """
+
+    def __init__(self, exc: Exception, failures: int) -> None:
+        self.exc = exc
+        self.failures = failures
+        self.calls = 0
+
+    def __call__(self) -> str:
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exc
+        return "ok"
+
+
+class TestTTLCache(unittest.TestCase):
+    def setUp(self) -> None:
+        # the clock is patched before decorating, so the cache never sees the real one
+        self.now_ns = 0
+        patcher = mock.patch("sturdy.utils.misc.time.monotonic_ns", side_effect=lambda: self.now_ns)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.calls = []
+
+        @ttl_cache(maxsize=1, ttl=12)
+        def single(*args: Any, **kwargs: Any) -> tuple:
+            self.calls.append((args, kwargs))
+            return args, kwargs
+
+        @ttl_cache(maxsize=1, typed=True, ttl=12)
+        def single_typed(x) -> type:
+            self.calls.append(x)
+            return type(x)
+
+        self.single = single
+        self.single_typed = single_typed
+
+    def test_hit_and_miss(self) -> None:
+        self.assertEqual(self.single(1), ((1,), {}))
+        self.assertEqual(self.single(1), ((1,), {}))
+        self.assertEqual(len(self.calls), 1)
+
+        self.assertEqual(self.single(2), ((2,), {}))
+        self.assertEqual(len(self.calls), 2)
+
+        # only the most recent call is kept
+        self.single(1)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_ttl_expiry(self) -> None:
+        self.single(1)
+        self.now_ns += 11 * SECOND_NS
+        self.single(1)
+        self.assertEqual(len(self.calls), 1)
+
+        self.now_ns += 2 * SECOND_NS
+        self.single(1)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_kwargs_dont_collide_with_tuples(self) -> None:
+        self.assertEqual(self.single(1, k=3), ((1,), {"k": 3}))
+        self.assertEqual(self.single((1,), (("k", 3),)), (((1,), (("k", 3),)), {}))
+        self.assertEqual(len(self.calls), 2)
+
+    def test_typed(self) -> None:
+        self.assertIs(self.single_typed(1), int)
+        self.assertIs(self.single_typed(1.0), float)
+        self.assertIs(self.single_typed(1.0), float)
+        self.assertEqual(self.calls, [1, 1.0])
+
+    def test_cache_info_and_clear(self) -> None:
+        info = self.single.cache_info()
+        self.assertEqual((info.hits, info.misses, info.maxsize, info.currsize), (0, 0, 1, 0))
+
+        self.single(1)
+        self.single(1)
+        self.single(2)
+        self.assertEqual(self.single.cache_info(), (1, 2, 1, 1))
+
+        self.single.cache_clear()
+        self.assertEqual(self.single.cache_info(), (0, 0, 1, 0))
+        self.single(2)
+        self.assertEqual(len(self.calls), 3)
+
+    def test_lru_path_ttl_expiry(self) -> None:
+        @ttl_cache(maxsize=8, ttl=12)
+        def cached(x) -> int:
+            self.calls.append(x)
+            return x
+
+        cached(1)
+        cached(2)
+        cached(1)
+        self.assertEqual(self.calls, [1, 2])
+
+        self.now_ns += 12 * SECOND_NS
+        cached(1)
+        self.assertEqual(self.calls, [1, 2, 1])
+
+
+class TestRetryWithBackoff(unittest.TestCase):
+    def setUp(self) -> None:
+        patcher = mock.patch("sturdy.utils.misc.time.sleep")
+        self.sleep = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def delays(self) -> list[float]:
+        return [call.args[0] for call in self.sleep.call_args_list]
+
+    def test_retries_on_429_status(self) -> None:
+        func = FlakyCall(HTTPStatusError(429), failures=3)
+        self.assertEqual(retry_with_backoff(func, base_delay=0.1, max_delay=0.5), "ok")
+        self.assertEqual(func.calls, 4)
+        self.assertEqual(self.sleep.call_count, 3)
+        for delay in self.delays():
+            self.assertGreaterEqual(delay, 0.1)
+            self.assertLessEqual(delay, 0.5)
+
+    def test_retries_on_rate_limit_message(self) -> None:
+        func = FlakyCall(Exception("Too Many Requests"), failures=1)
+        self.assertEqual(retry_with_backoff(func), "ok")
+        self.assertEqual(func.calls, 2)
+
+    def test_max_retries_exceeded(self) -> None:
+        func = FlakyCall(HTTPStatusError(429), failures=100)
+        func.__name__ = "flaky"
+        with pytest.raises(Exception, match=r"Maximum retries \(3\) exceeded for flaky"):
+            retry_with_backoff(func, max_retries=3, base_delay=0.1, max_delay=0.2)
+        self.assertEqual(func.calls, 3)
+        self.assertEqual(self.sleep.call_count, 3)
+        for delay in self.delays():
+            self.assertGreaterEqual(delay, 0.1)
+            self.assertLessEqual(delay, 0.2)
+
+    def test_other_errors_are_reraised(self) -> None:
+        # the digits of a 429 status in the message alone shouldn't count as rate limiting
+        func = FlakyCall(ValueError("execution reverted at block 4290001"), failures=1)
+        with pytest.raises(ValueError, match="execution reverted"):
+            retry_with_backoff(func)
+        self.assertEqual(func.calls, 1)
+        self.sleep.assert_not_called()
+
+        func = FlakyCall(HTTPStatusError(500), failures=1)
+        with pytest.raises(HTTPStatusError):
+            retry_with_backoff(func)
+        self.assertEqual(func.calls, 1)
+        self.sleep.assert_not_called()
+
+
+class TestRandrangeFloat(unittest.TestCase):
+    def test_bounds_are_inclusive(self) -> None:
+        rng = mock.Mock(spec=random.Random)
+        rng.randint.side_effect = lambda low, _: low
+        self.assertEqual(randrange_float(0.1, 0.9, 0.2, rng_gen=rng), 0.1)
+        rng.randint.side_effect = lambda _, high: high
+        self.assertEqual(randrange_float(0.1, 0.9, 0.2, rng_gen=rng), 0.9)
+
+    def test_multiples_of_step(self) -> None:
+        rng = random.Random(69)  # noqa: S311
+        values = {randrange_float(0.1, 0.9, 0.2, rng_gen=rng) for _ in range(200)}
+        self.assertEqual(values, {0.1, 0.3, 0.5, 0.7, 0.9})
+
+        values = {randrange_float(1, 10, 3, rng_gen=rng) for _ in range(200)}
+        self.assertEqual(values, {1.0, 4.0, 7.0, 10.0})
+
+    def test_stop_between_steps(self) -> None:
+        rng = random.Random(69)  # noqa: S311
+        values = {randrange_float(0, 1, 0.3, rng_gen=rng) for _ in range(200)}
+        self.assertEqual(values, {0.0, 0.3, 0.6, 0.9})
+
+    def test_precision(self) -> None:
+        rng = random.Random(69)  # noqa: S311
+        values = {randrange_float(0, 0.03, 0.01, sig=2, rng_gen=rng) for _ in range(200)}
+        self.assertEqual(values, {0.0, 0.01, 0.02, 0.03})
+
+    def test_invalid_step(self) -> None:
+        with pytest.raises(ValueError, match="step must be a positive multiple"):
+            randrange_float(0, 1, 0)
+        with pytest.raises(ValueError, match="step must be a positive multiple"):
+            randrange_float(1, 0, -0.1)
+        # steps below the output precision round down to 0
+        with pytest.raises(ValueError, match="step must be a positive multiple"):
+            randrange_float(0, 1, 0.001, sig=2)
+
+
+if __name__ == "__main__":
+    unittest.main()
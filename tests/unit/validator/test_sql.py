@@ -16,9 +16,11 @@ from sturdy.validator.sql import (
     get_request_info,
     log_allocations,
     log_request,
+    rate_limit_exceeded,
     update_api_key_balance,
     update_api_key_name,
     update_api_key_rate_limit,
+    update_requests_and_credits,
 )
 from tests.helpers import create_tables
 
@@ -63,6 +65,17 @@ class TestSQLFunctions(unittest.TestCase):
             info = get_api_key_info(conn, "test_key")
             self.assertEqual(info["balance"], 200.0)
 
+    def test_update_requests_and_credits(self) -> None:
+        with get_db_connection(TEST_DB) as conn:
+            # Add an API key
+            add_api_key(conn, "test_key", 100.0, 60, "Test Key")
+            # Deduct the cost of a request from the balance
+            api_key_info = get_api_key_info(conn, "test_key")
+            update_requests_and_credits(conn, api_key_info, 2.5)
+            # Retrieve the updated information
+            info = get_api_key_info(conn, "test_key")
+            self.assertEqual(info["balance"], 97.5)
+
     def test_update_api_key_rate_limit(self) -> None:
         with get_db_connection(TEST_DB) as conn:
             # Add an API key
@@ -118,6 +131,18 @@ class TestSQLFunctions(unittest.TestCase):
             self.assertEqual(logs[0]["endpoint"], "/test_endpoint")
             self.assertEqual(logs[0]["cost"], 1.0)
 
+    def test_rate_limit_exceeded(self) -> None:
+        with get_db_connection(TEST_DB) as conn:
+            # Add an API key which may only make two requests per minute
+            add_api_key(conn, "test_key", 100.0, 2, "Test Key")
+            api_key_info = get_api_key_info(conn, "test_key")
+            self.assertFalse(rate_limit_exceeded(conn, api_key_info))
+            # Log requests up to the rate limit
+            log_request(conn, api_key_info, "/test_endpoint", 1.0)
+            self.assertFalse(rate_limit_exceeded(conn, api_key_info))
+            log_request(conn, api_key_info, "/test_endpoint", 1.0)
+            self.assertTrue(rate_limit_exceeded(conn, api_key_info))
+
     def test_get_db_connection(self) -> None:
         # Test the get_db_connection function
         with get_db_connection(TEST_DB) as conn: